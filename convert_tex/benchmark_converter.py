@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the LaTeX to Quarto Book Converter
+
+This script generates synthetic LaTeX books at multiples of the size of
+`extracted_latex`, times each pure-Python transform of
+`convert_to_quarto_book.py` and the end-to-end `main()` with pandoc and the
+PDF rasterizers stubbed out, and compares the results against stored
+baselines so that slowdowns are flagged.
+
+Usage:
+    python3 benchmark_converter.py --save-baseline   # record a baseline
+    python3 benchmark_converter.py                   # compare against it
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import convert_to_quarto_book as converter
+
+# Size of the real book in extracted_latex, which the scales are relative to
+REFERENCE_SECTION_CHARS = 310_000
+REFERENCE_BIB_ENTRIES = 664
+REFERENCE_ACRONYMS = 119
+REFERENCE_FIGURES = 90
+
+# Sections the converter expects, with the title written into each file
+SECTION_FILES = [
+    ("introduction.tex", "Introduction"),
+    ("data_taxonomy.tex", "The Shape and Structure of Chemical Data"),
+    ("architectures.tex", "Building Principles of GPMs"),
+    ("evals.tex", "Evaluations"),
+    ("applications.tex", "Applications"),
+    ("safety.tex", "Implications of GPMs: Education, Safety, and Ethics"),
+    ("outlook_conclusions.tex", "Outlook and Conclusions"),
+]
+
+WORDS = (
+    "model chemistry molecule reaction language data property prediction benchmark "
+    "training synthesis catalyst crystal spectrum dataset agent planning evaluation "
+    "representation transformer token embedding retrieval experiment laboratory"
+).split()
+
+DEFAULT_BASELINE = Path(__file__).parent / "benchmark_baseline.json"
+
+
+def _sentence(rng, n_words=18):
+    words = [rng.choice(WORDS) for _ in range(n_words)]
+    return " ".join(words).capitalize() + "."
+
+
+def _cite(rng, bib_keys):
+    keys = rng.sample(bib_keys, k=rng.randint(1, 3))
+    # Occasionally produce the malformed key lists the converter has to repair
+    if rng.random() < 0.05:
+        keys.append("")
+    return "\\autocite{" + ", ".join(keys) + "}"
+
+
+def generate_latex_paragraph(rng, bib_keys, acronym_keys, figure_names):
+    """Generate one LaTeX paragraph with citations, acronyms and custom commands."""
+    parts = []
+    for _ in range(rng.randint(3, 7)):
+        sentence = _sentence(rng)
+        if rng.random() < 0.6:
+            sentence = sentence[:-1] + " " + _cite(rng, bib_keys) + "."
+        if rng.random() < 0.4:
+            sentence = f"\\gls{{{rng.choice(acronym_keys)}}} " + sentence
+        if rng.random() < 0.1:
+            sentence += " \\modelname{ChemModel} uses \\ce{H2O} as solvent."
+        parts.append(sentence)
+    paragraph = " ".join(parts)
+    if figure_names and rng.random() < 0.05:
+        figure = rng.choice(figure_names)
+        paragraph += (
+            "\n\n\\begin{figure}\n    \\centering\n"
+            f"    \\includegraphics[width=1\\textwidth]{{figures/{figure}.pdf}}\n"
+            f"    \\caption{{{_sentence(rng)} {_cite(rng, bib_keys)}}}\n"
+            f"    \\label{{fig:{figure}}}\n\\end{{figure}}"
+        )
+    if rng.random() < 0.01:
+        paragraph += (
+            "\n\n\\begin{tcolorbox}[title=Next-token prediction]\n"
+            "\\begin{equation}\n    \\label{eq:nexttoken}\n"
+            "    p(x) = \\prod_t p(x_t \\mid x_{<t})\n\\end{equation}\n"
+            f"{_sentence(rng)}\n\\end{{tcolorbox}}"
+        )
+    return paragraph
+
+
+def generate_bibliography(rng, n_entries):
+    """Generate a BibTeX file with `n_entries` entries, returning (text, keys)."""
+    keys = [f"author{i}{rng.choice(WORDS)}" for i in range(n_entries)]
+    entries = []
+    for key in keys:
+        entries.append(
+            f"@article{{{key},\n"
+            f"  title = {{{_sentence(rng, 10)[:-1]} – α-{rng.choice(WORDS)} at 25 °C}},\n"
+            f"  author = {{Doe, Jane and Roe, Richard and {rng.choice(WORDS).capitalize()}, A.}},\n"
+            f"  journal = {{Journal of {rng.choice(WORDS).capitalize()}}},\n"
+            f"  year = {{{rng.randint(1990, 2025)}}},\n"
+            f"  doi = {{10.{rng.randint(1000, 9999)}/{rng.randint(100000, 999999)}}},\n"
+            f"  abstract = {{{' '.join(_sentence(rng) for _ in range(4))}}}\n"
+            "}\n"
+        )
+    return "\n".join(entries), keys
+
+
+def generate_synthetic_book(root, scale, seed=0):
+    """
+    Write a synthetic LaTeX book `scale` times the size of extracted_latex to `root`.
+
+    Returns:
+        Dict with the number of characters, citations and files generated
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    (root / "sections").mkdir(parents=True, exist_ok=True)
+    (root / "extras").mkdir(exist_ok=True)
+    (root / "figures").mkdir(exist_ok=True)
+
+    bib_text, bib_keys = generate_bibliography(rng, REFERENCE_BIB_ENTRIES * scale)
+    (root / "references.bib").write_text(bib_text, encoding="utf-8")
+
+    acronym_keys = [f"acr{i}" for i in range(REFERENCE_ACRONYMS)]
+    acronyms = "\n".join(f"\\newacronym{{{key}}}{{{key.upper()}}}{{{rng.choice(WORDS)} {rng.choice(WORDS)}}}" for key in acronym_keys)
+    (root / "acronyms.tex").write_text(acronyms + "\n", encoding="utf-8")
+
+    figure_names = [f"figure_{i}" for i in range(REFERENCE_FIGURES * scale)]
+    for name in figure_names:
+        (root / "figures" / f"{name}.pdf").write_bytes(b"%PDF-1.4\n% synthetic\n")
+
+    (root / "extras" / "table.tex").write_text(
+        "\\begin{table}\n\\begin{tabular}{ll}\na & b \\\\\n\\end{tabular}\n\\end{table}\n",
+        encoding="utf-8",
+    )
+    (root / "main.tex").write_text(
+        "\\documentclass{article}\n\\title{Synthetic Book}\n\\begin{document}\n"
+        f"\\begin{{abstract}}\n{_sentence(rng)} {_cite(rng, bib_keys)}\n\\end{{abstract}}\n"
+        "\\end{document}\n",
+        encoding="utf-8",
+    )
+
+    chars_per_section = REFERENCE_SECTION_CHARS * scale // len(SECTION_FILES)
+    total_chars = 0
+    for file_name, title in SECTION_FILES:
+        parts = [f"\\section{{{title}}} \\label{{sec:{file_name[:-4]}}}"]
+        size = 0
+        subsection = 0
+        split_written = file_name != "applications.tex"
+        while size < chars_per_section:
+            if rng.random() < 0.08:
+                subsection += 1
+                level = rng.choice(["subsection", "subsubsection", "paragraph"])
+                parts.append(f"\\{level}{{Part {subsection}}}")
+            paragraph = generate_latex_paragraph(rng, bib_keys, acronym_keys, figure_names)
+            parts.append(paragraph)
+            size += len(paragraph)
+            if not split_written and size > chars_per_section // 2:
+                # split_applications_file() cuts the chapter here
+                parts.append("\\section{Accelerating Applications}")
+                split_written = True
+            if file_name == "architectures.tex" and subsection == 1 and rng.random() < 0.02:
+                parts.append("\\input{extras/table}")
+        text = "\n\n".join(parts) + "\n"
+        (root / "sections" / file_name).write_text(text, encoding="utf-8")
+        total_chars += len(text)
+
+    return {
+        "section_chars": total_chars,
+        "bib_entries": len(bib_keys),
+        "figures": len(figure_names),
+    }
+
+
+def generate_markdown_chapter(rng, scale):
+    """Generate markdown shaped like pandoc's output for the post-processing transforms."""
+    chars = REFERENCE_SECTION_CHARS * scale
+    parts = ["---\ntitle: Synthetic\n---\n", "# Synthetic Chapter"]
+    size = 0
+    while size < chars:
+        block = rng.random()
+        if block < 0.05:
+            parts.append("#" * rng.randint(2, 5) + " " + _sentence(rng, 4))
+        elif block < 0.10:
+            figure = f"figure_{rng.randint(0, 99)}"
+            parts.append(f'![{_sentence(rng, 5)}](figures/{figure}.pdf "caption")')
+        elif block < 0.11:
+            parts.append(f'::::: tcolorbox\n[]{{#eq:nexttoken label="eq:nexttoken"}}\n$$p(x) = \\prod_t p(x_t)$$\n{_sentence(rng)}\n:::::')
+        elif block < 0.115:
+            parts.append('::: promptbox\n[]{#box:cot_prompting label="box:cot_prompting"}\n' + f"{_sentence(rng)}\n:::")
+        else:
+            sentence = " ".join(_sentence(rng) for _ in range(4))
+            parts.append(sentence + f" [@key{rng.randint(0, 999)}; \\@key{rng.randint(0, 999)}]" + ' [LLMs]{acronym-label="llm" acronym-form="plural+short"}.')
+        size += len(parts[-1])
+    return "\n\n".join(parts) + "\n"
+
+
+def time_call(func, repeat):
+    """Return the best wall time of `repeat` calls of `func`, with its output suppressed."""
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start_time = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def benchmark_transforms(book_dir, scale, repeat):
+    """Time each pure-Python transform on the synthetic book."""
+    rng = random.Random(scale)
+    latex = "\n\n".join((book_dir / "sections" / file_name).read_text(encoding="utf-8") for file_name, _ in SECTION_FILES)
+    bibliography = (book_dir / "references.bib").read_text(encoding="utf-8")
+    cleaned_latex = converter.clean_latex_content(latex)
+    markdown = generate_markdown_chapter(rng, scale)
+    translation_table = str.maketrans(
+        {char: replacement for mappings in converter.BIBLIOGRAPHY_NORMALIZATION.values() for char, replacement in mappings.items()}
+    )
+
+    benchmarks = {
+        "clean_latex_content": lambda: converter.clean_latex_content(latex),
+        "clean_latex_content (regex reference)": lambda: converter._clean_latex_content_regex(latex),
+        "convert_citations_to_markdown": lambda: converter.convert_citations_to_markdown(cleaned_latex),
+        "resolve_input_commands": lambda: converter.resolve_input_commands(latex, book_dir),
+        "clean_bibliography_content": lambda: converter.clean_bibliography_content(bibliography),
+        "str.translate (bibliography reference)": lambda: bibliography.translate(translation_table),
+        "normalize_stream (bibliography)": lambda: converter.BIBLIOGRAPHY_NORMALIZER.normalize_stream(io.StringIO(bibliography), io.StringIO()),
+        "fix_heading_levels": lambda: converter.fix_heading_levels(markdown),
+        "rewrite_image_references": lambda: converter.rewrite_image_references(markdown),
+        "clean_citation_formatting_in_markdown": lambda: converter.clean_citation_formatting_in_markdown(markdown),
+        "replace_boxes_in_content": lambda: converter.replace_boxes_in_content(markdown),
+        "enforce_image_width": lambda: converter.enforce_image_width(markdown),
+        "convert_latex_acronyms_to_glossary_shortcodes": lambda: converter.convert_latex_acronyms_to_glossary_shortcodes(markdown),
+    }
+    return {name: time_call(func, repeat) for name, func in benchmarks.items()}
+
+
+class StubPandoc:
+    """Pandoc backend stand-in that turns sectioning commands into markdown headings."""
+
+    name = "benchmark-stub"
+
+    def convert(self, latex, extract_media_dir, from_format="latex", to_format=None):
+        markdown = re.sub(r"\\section\{([^}]*)\}", r"# \1", latex)
+        markdown = re.sub(r"\\subsection\{([^}]*)\}", r"## \1", markdown)
+        markdown = re.sub(r"\\subsubsection\{([^}]*)\}", r"### \1", markdown)
+        return True, "---\ntitle: stub\n---\n\n" + markdown
+
+    def close(self):
+        pass
+
+
+def _stub_run_tool(cmd):
+    """Stand-in for external rasterizers that writes a tiny PNG."""
+    output = Path(cmd[-1])
+    if cmd[0] == "pdftoppm":
+        output = output.with_suffix(".png")
+    output.write_bytes(b"\x89PNG\r\n\x1a\n")
+    return True, ""
+
+
+def benchmark_end_to_end(book_dir, output_dir, repeat):
+    """Time converter.main() on the synthetic book with pandoc and rasterizers stubbed."""
+    argv = [
+        "convert_to_quarto_book.py",
+        "--input-dir",
+        str(book_dir),
+        "--output-dir",
+        str(output_dir),
+        "--zip-file",
+        "",
+        "--no-cache",
+        "--jobs",
+        "1",
+        "--manifest",
+        str(output_dir.parent / "convert_manifest.json"),
+    ]
+    original = (converter.SubprocessPandoc, converter._run_tool, sys.argv)
+    converter.SubprocessPandoc = StubPandoc
+    converter._run_tool = _stub_run_tool
+    sys.argv = argv
+    try:
+        return time_call(converter.main, repeat)
+    finally:
+        converter.SubprocessPandoc, converter._run_tool, sys.argv = original
+
+
+def compare_with_baseline(results, baseline, threshold):
+    """Return the benchmarks that are slower than their baseline by more than `threshold`."""
+    regressions = []
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        if reference and seconds > reference * (1 + threshold):
+            regressions.append((name, reference, seconds))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the LaTeX to Quarto converter")
+    parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="+",
+        default=[1, 10, 100],
+        help="Book sizes to benchmark, as multiples of extracted_latex",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark (best is kept)")
+    parser.add_argument("--skip-end-to-end", action="store_true", help="Only benchmark the individual transforms")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="JSON file with baseline timings")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run's timings as the new baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Relative slowdown over the baseline that is flagged (default: 0.25)",
+    )
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="convert-bench-") as temp_dir:
+        for scale in args.scales:
+            book_dir = Path(temp_dir) / f"book_{scale}x"
+            stats = generate_synthetic_book(book_dir, scale)
+            print(
+                f"\n{scale}x book: {stats['section_chars'] / 1e6:.2f}M section chars, {stats['bib_entries']} bibliography entries, {stats['figures']} figures"
+            )
+            timings = benchmark_transforms(book_dir, scale, args.repeat)
+            if not args.skip_end_to_end:
+                timings["main (pandoc stubbed)"] = benchmark_end_to_end(book_dir, Path(temp_dir) / f"out_{scale}x", args.repeat)
+            for name, seconds in timings.items():
+                print(f"  {name:<48} {seconds * 1000:10.1f} ms")
+                results[f"{scale}x/{name}"] = seconds
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"\nSaved baseline to {baseline_path}")
+        return
+
+    if not baseline_path.exists():
+        print(f"\nNo baseline at {baseline_path}; run with --save-baseline to record one")
+        return
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    regressions = compare_with_baseline(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nSlowdowns of more than {args.threshold:.0%} against {baseline_path}:")
+        for name, reference, seconds in regressions:
+            print(f"  {name}: {reference * 1000:.1f} ms -> {seconds * 1000:.1f} ms")
+        sys.exit(1)
+    print(f"\nNo slowdowns of more than {args.threshold:.0%} against {baseline_path}")
+
+
+if __name__ == "__main__":
+    main()
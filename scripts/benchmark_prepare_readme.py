@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the README generator
+
+This script generates a synthetic BibTeX file, by default with 10k entries,
+and times the BibTeX parsers of `prepare_readme.py` on it: the streaming
+tokenizer used as the fallback, the previous regex-based fallback and, if it
+is installed, `bibtexparser`. It also measures with tracemalloc the memory
+held by the parsed `Citation` records, against plain dataclass records
+without slots or interning.
+
+Usage:
+    python3 benchmark_prepare_readme.py
+    python3 benchmark_prepare_readme.py --entries 50000 --repeat 5
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+
+import prepare_readme
+
+WORDS = (
+    "model chemistry molecule reaction language data property prediction benchmark "
+    "training synthesis catalyst crystal spectrum dataset agent planning evaluation "
+    "representation transformer token embedding retrieval experiment laboratory"
+).split()
+
+JOURNALS = ["J. Am. Chem. Soc.", "Nature", "Digital Discovery", "Chem. Sci."]
+
+
+def _words(rng, n_words):
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def generate_bib_entry(rng, index):
+    """Generate one BibTeX entry mixing braced, quoted, numeric and macro values."""
+    title = _words(rng, 8).capitalize()
+    if rng.random() < 0.5:
+        title = f"{{{title.split()[0].upper()}}}: {title} with {{nested {{braces}}}}"
+    authors = " and ".join(f"{_words(rng, 1).capitalize()}, {chr(65 + rng.randrange(26))}." for _ in range(rng.randint(1, 8)))
+    fields = [
+        f"  title = {{{title}}}",
+        f"  author = {{{authors}}}",
+        f"  year = {rng.randint(1990, 2025)}",
+        f"  month = {rng.choice(list(prepare_readme.BIBTEX_MONTHS))}",
+        f"  abstract = {{{_words(rng, rng.randint(50, 250))}}}",
+    ]
+    if rng.random() < 0.3:
+        fields.append(f'  journal = "{rng.choice(JOURNALS)}"')
+    else:
+        fields.append(f"  journal = jnl{rng.randrange(len(JOURNALS))}")
+    if rng.random() < 0.2:
+        fields.append(f'  note = "Presented at " # conf # " {rng.randint(2000, 2025)}"')
+    if rng.random() < 0.7:
+        fields.append(f"  doi = {{10.{rng.randint(1000, 9999)}/bench.{index}}}")
+    else:
+        fields.append(f"  eprint = {{{rng.randint(2000, 2599)}.{index:05d}}}")
+    entry_type = rng.choice(["article", "inproceedings", "misc"])
+    return f"@{entry_type}{{bench{index},\n" + ",\n".join(fields) + "\n}\n"
+
+
+def generate_bib_file(path, n_entries, seed=0):
+    """Write a synthetic BibTeX file with `n_entries` entries and a few @string macros."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("@comment{Synthetic bibliography for benchmark_prepare_readme.py}\n\n")
+        for i, journal in enumerate(JOURNALS):
+            f.write(f'@string{{jnl{i} = "{journal}"}}\n')
+        f.write('@string{conf = "the Benchmark Conference"}\n\n')
+        for index in range(n_entries):
+            f.write(generate_bib_entry(rng, index))
+            f.write("\n")
+
+
+def time_call(func, repeat):
+    """Return the best wall time of `repeat` calls of `func` and its last result, with output suppressed."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start_time = time.perf_counter()
+            result = func()
+            best = min(best, time.perf_counter() - start_time)
+    return best, result
+
+
+def benchmark_parsers(bib_file, repeat):
+    """Time each available BibTeX parser on `bib_file`."""
+    parser = prepare_readme.BibTeXParser()
+    benchmarks = {
+        "tokenizer": lambda: parser._parse_with_tokenizer(bib_file),
+        "regex (previous fallback)": lambda: parser._parse_with_regex(bib_file),
+    }
+    if prepare_readme.BIBTEXPARSER_AVAILABLE:
+        benchmarks["bibtexparser"] = lambda: parser._parse_with_bibtexparser(bib_file)
+    else:
+        print("Note: bibtexparser not available, skipping it. Install with: pip install bibtexparser")
+    return {name: time_call(func, repeat) for name, func in benchmarks.items()}
+
+
+@dataclass
+class PlainCitation:
+    """`prepare_readme.Citation` as a plain dataclass, the reference for the memory benchmark."""
+
+    key: str
+    title: str = ""
+    year: str = ""
+    url: str = ""
+    authors: str = ""
+    journal: str = ""
+    doi: str = ""
+
+
+def measure_memory(bib_file, citation_class):
+    """Return (held, peak) bytes allocated while parsing `bib_file` into `citation_class` records."""
+    parser = prepare_readme.BibTeXParser()
+    original_class = prepare_readme.Citation
+    prepare_readme.Citation = citation_class
+    gc.collect()
+    tracemalloc.start()
+    try:
+        citations = parser._parse_with_tokenizer(bib_file)
+        held, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        prepare_readme.Citation = original_class
+    del citations
+    return held, peak
+
+
+def benchmark_memory(bib_file):
+    """Measure the memory of the parsed records with the compact and the plain classes."""
+    return {
+        "plain dataclass": measure_memory(bib_file, PlainCitation),
+        "slots + interning": measure_memory(bib_file, prepare_readme.Citation),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the BibTeX parsers of prepare_readme.py")
+    parser.add_argument("--entries", type=int, default=10_000, help="Number of entries in the synthetic file")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per parser; the best time is reported")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bib_file = Path(tmp_dir) / "benchmark.bib"
+        generate_bib_file(bib_file, args.entries, args.seed)
+        size_mb = bib_file.stat().st_size / 1e6
+        print(f"Synthetic bibliography: {args.entries} entries, {size_mb:.1f} MB")
+
+        results = benchmark_parsers(bib_file, args.repeat)
+        memory = benchmark_memory(bib_file)
+
+    reference = results["tokenizer"][0]
+    print(f"\n{'parser':<28}{'entries':>9}{'seconds':>10}{'entries/s':>12}{'vs tokenizer':>14}")
+    for name, (seconds, citations) in results.items():
+        print(f"{name:<28}{len(citations):>9}{seconds:>10.3f}{len(citations) / seconds:>12.0f}{seconds / reference:>13.2f}x")
+
+    reference_held = memory["plain dataclass"][0]
+    print(f"\n{'citation records':<28}{'held MB':>9}{'peak MB':>10}{'bytes/entry':>13}{'vs plain':>10}")
+    for name, (held, peak) in memory.items():
+        print(f"{name:<28}{held / 1e6:>9.1f}{peak / 1e6:>10.1f}{held / args.entries:>13.0f}{held / reference_held:>9.2f}x")
+
+    if len(results["tokenizer"][1]) != args.entries:
+        print(f"Error: tokenizer parsed {len(results['tokenizer'][1])} of {args.entries} entries")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,13 +3,19 @@
 Script to generate README.md from LaTeX sections with extracted citations and bibliography.
 """
 
+import argparse
+import hashlib
+import io
+import json
 import os
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
-from collections import defaultdict
+from typing import Dict, Iterator, List, Tuple, Optional, TextIO
+from dataclasses import asdict, dataclass, field
+from operator import attrgetter
 
 # Try to import bibtexparser for better BibTeX parsing
 try:
@@ -19,14 +25,30 @@ try:
     BIBTEXPARSER_AVAILABLE = True
 except ImportError:
     BIBTEXPARSER_AVAILABLE = False
-    print(
-        "Note: bibtexparser not available, using fallback parser. Install with: pip install bibtexparser"
-    )
+
+# Persistent cache of this script, in the repository root
+DEFAULT_BLOCK_CACHE_PATH = Path(__file__).resolve().parent.parent / ".cache" / "readme_blocks.json"
+
+
+# Month macros predefined by BibTeX styles
+BIBTEX_MONTHS = {
+    month: month.capitalize()
+    for month in ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+}
+
+
+YEAR_PATTERN = re.compile(r"\d{4}")
 
 
-@dataclass
+@dataclass(slots=True)
 class Citation:
-    """Represents a citation with its bibliographic information."""
+    """
+    Represents a citation with its bibliographic information.
+
+    Years and journals repeat across a bibliography, so they are interned.
+    `sort_year` is the first four-digit number of `year`, or 0 if there is none
+    (e.g. "in press"), and is used to sort citations.
+    """
 
     key: str
     title: str = ""
@@ -34,31 +56,45 @@ class Citation:
     url: str = ""
     authors: str = ""
     journal: str = ""
+    doi: str = ""
+    sort_year: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.year = sys.intern(self.year)
+        self.journal = sys.intern(self.journal)
+        year_match = YEAR_PATTERN.search(self.year)
+        self.sort_year = int(year_match.group(0)) if year_match else 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Section:
     """Represents a document section with its hierarchy and citations."""
 
     level: int  # 1=section, 2=subsection, 3=subsubsection, etc.
     title: str
     label: str = ""
-    citations: List[str] = None
+    citations: List[str] = field(default_factory=list)
 
-    def __post_init__(self):
-        if self.citations is None:
-            self.citations = []
+
+# Citation commands of natbib and biblatex, including those handled by the converter
+CITE_COMMANDS = (
+    "cite", "citep", "citet", "citealp", "citealt", "textcite", "parencite",
+    "autocite", "footcite", "supercite", "smartcite",
+)
 
 
 class LaTeXParser:
     """Parser for LaTeX files to extract sections and citations."""
 
     def __init__(self):
-        # Regex patterns for parsing
-        self.section_pattern = re.compile(
-            r"\\(sub)*section\*?\{([^}]+)\}(?:\s*\\label\{([^}]+)\})?", re.IGNORECASE
+        # One pattern for sectioning and citation commands, so a file is scanned once
+        self.token_pattern = re.compile(
+            r"\\(?:"
+            r"(?P<sub>(?:sub)*)section\*?\{(?P<title>[^}]+)\}(?:\s*\\label\{(?P<label>[^}]+)\})?"
+            r"|(?:" + "|".join(CITE_COMMANDS) + r")\*?(?:\s*\[[^\]]*\]){0,2}\s*\{(?P<keys>[^}]+)\}"
+            r")",
+            re.IGNORECASE,
         )
-        self.citation_pattern = re.compile(r"\\autocite\{([^}]+)\}")
 
     def parse_file(self, filepath: Path) -> List[Section]:
         """Parse a LaTeX file and extract sections with citations."""
@@ -71,70 +107,246 @@ class LaTeXParser:
             print(f"Error reading {filepath}: {e}")
             return sections
 
-        # Find all sections
-        section_matches = list(self.section_pattern.finditer(content))
-
-        for i, match in enumerate(section_matches):
-            # Determine section level
-            section_type = match.group(0).lower()
-            if "\\subsubsection" in section_type:
-                level = 3
-            elif "\\subsection" in section_type:
-                level = 2
-            elif "\\section" in section_type:
-                level = 1
-            else:
-                level = 1
-
-            title = match.group(2).strip()
-            label = match.group(3) if match.group(3) else ""
-
-            # Find citations in this section
-            start_pos = match.end()
-            end_pos = (
-                section_matches[i + 1].start()
-                if i + 1 < len(section_matches)
-                else len(content)
-            )
-            section_content = content[start_pos:end_pos]
-
-            # Find all citation groups and split multiple citations
-            citation_groups = self.citation_pattern.findall(section_content)
-            citations = []
-            for group in citation_groups:
-                # Split by comma and clean up each citation key
-                keys = [key.strip() for key in group.split(",") if key.strip()]
-                citations.extend(keys)
-
-            # Remove duplicates while preserving order
-            unique_citations = []
-            seen = set()
-            for cite in citations:
-                if cite not in seen:
-                    unique_citations.append(cite)
-                    seen.add(cite)
-
-            sections.append(
-                Section(
-                    level=level, title=title, label=label, citations=unique_citations
+        # Citations belong to the last section seen; those before the first section are ignored
+        seen = set()
+        for match in self.token_pattern.finditer(content):
+            title = match.group("title")
+            if title is not None:
+                sections.append(
+                    Section(
+                        level=1 + len(match.group("sub")) // 3,
+                        title=title.strip(),
+                        label=match.group("label") or "",
+                    )
                 )
-            )
+                seen = set()
+            elif sections:
+                for key in match.group("keys").split(","):
+                    key = key.strip()
+                    # Remove duplicates while preserving order
+                    if key and key not in seen:
+                        sections[-1].citations.append(key)
+                        seen.add(key)
 
         return sections
 
+    def parse_timed(self, filepath: Path) -> Tuple[List[Section], float]:
+        """Parse a LaTeX file and return its sections with the parse time in seconds."""
+        start_time = time.perf_counter()
+        sections = self.parse_file(filepath)
+        return sections, time.perf_counter() - start_time
+
+    def parse_files(self, filepaths: List[Path], jobs: int = 1) -> Dict[Path, Tuple[List[Section], float]]:
+        """
+        Parse several LaTeX files, in `jobs` worker processes when there is more than one.
+
+        Returns:
+            Dictionary mapping each file to its sections and parse time in seconds
+        """
+        jobs = min(jobs or os.cpu_count() or 1, len(filepaths))
+        if jobs <= 1:
+            return {filepath: self.parse_timed(filepath) for filepath in filepaths}
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return dict(zip(filepaths, executor.map(self.parse_timed, filepaths)))
+
+
+class BibTeXTokenizer:
+    """
+    Single-pass BibTeX tokenizer that streams entries from a file.
+
+    Entries are found by tracking brace depth, so the cost is linear in the
+    file size. Field values may be braced, quoted, numbers or `@string`
+    macros, joined with `#`. `@comment` and `@preamble` entries are skipped.
+    """
+
+    ENTRY_START = re.compile(r"@\s*([A-Za-z]+)\s*([{(])")
+    BRACES = re.compile(r"[{}]")
+    BRACES_AND_CLOSING_PAREN = re.compile(r"[{})]")
+    # An escaped \" is matched as a whole, so it does not end a quoted value
+    QUOTED_DELIMITERS = re.compile(r'\\"|[{}"]')
+    FIELD_NAME = re.compile(r"[\s,]*([^\s=,{}\"#()]+)\s*=\s*")
+    BARE_VALUE = re.compile(r"[^\s,#{}\"()]+")
+    WHITESPACE = re.compile(r"\s*")
+
+    def __init__(self, chunk_size: int = 1 << 16):
+        self.chunk_size = chunk_size
+        self.strings: Dict[str, str] = dict(BIBTEX_MONTHS)
+
+    def raw_entries(self, stream: TextIO) -> Iterator[Tuple[str, str]]:
+        """Yield (lowercase entry type, text between the entry's delimiters) for each entry."""
+        buffer = ""
+        position = 0
+        eof = False
+        while True:
+            start = self.ENTRY_START.search(buffer, position)
+            if start is None:
+                if eof:
+                    return
+                # Keep a trailing partial "@type" for the next chunk
+                at = buffer.rfind("@", position)
+                buffer = buffer[at:] if at != -1 else ""
+                position = 0
+                chunk = stream.read(self.chunk_size)
+                eof = not chunk
+                buffer += chunk
+                continue
+
+            delimiters = self.BRACES if start.group(2) == "{" else self.BRACES_AND_CLOSING_PAREN
+            depth = 0
+            scan = start.end()
+            end = None
+            while end is None:
+                for match in delimiters.finditer(buffer, scan):
+                    char = match.group()
+                    if char == "{":
+                        depth += 1
+                    elif depth == 0:
+                        # "}" closes a brace entry, ")" a paren entry
+                        end = match.start()
+                        break
+                    elif char == "}":
+                        depth -= 1
+                if end is not None:
+                    break
+                chunk = stream.read(self.chunk_size)
+                if not chunk:
+                    print(f"Warning: Unterminated @{start.group(1)} entry at end of bibliography")
+                    return
+                # Drop what was consumed before the entry so the buffer stays small
+                scan = len(buffer) - start.start()
+                buffer = buffer[start.start():] + chunk
+                start = self.ENTRY_START.match(buffer)
+
+            yield start.group(1).lower(), buffer[start.end():end]
+            position = end + 1
+
+    def _matching(self, text: str, position: int, pattern, closing: str) -> int:
+        """Return the index of `closing` at brace depth 0, scanning from `position`."""
+        depth = 0
+        for match in pattern.finditer(text, position):
+            char = match.group()
+            if char == "{":
+                depth += 1
+            elif depth == 0 and char == closing:
+                return match.start()
+            elif char == "}":
+                depth -= 1
+        return len(text)
+
+    def parse_value(self, text: str, position: int) -> Tuple[str, int]:
+        """Parse a field value starting at `position`, returning it and the position after it."""
+        parts = []
+        while True:
+            position = self.WHITESPACE.match(text, position).end()
+            if position >= len(text):
+                break
+            char = text[position]
+            if char == "{":
+                end = self._matching(text, position + 1, self.BRACES, "}")
+                parts.append(text[position + 1:end])
+                position = end + 1
+            elif char == '"':
+                end = self._matching(text, position + 1, self.QUOTED_DELIMITERS, '"')
+                parts.append(text[position + 1:end])
+                position = end + 1
+            else:
+                match = self.BARE_VALUE.match(text, position)
+                if match is None:
+                    break
+                token = match.group()
+                parts.append(token if token.isdigit() else self.strings.get(token.lower(), token))
+                position = match.end()
+            position = self.WHITESPACE.match(text, position).end()
+            if position < len(text) and text[position] == "#":
+                position += 1
+                continue
+            break
+        return "".join(parts), position
+
+    def parse_fields(self, text: str, position: int = 0) -> Dict[str, str]:
+        """Parse `name = value` pairs; the first occurrence of a field wins."""
+        fields = {}
+        while True:
+            match = self.FIELD_NAME.match(text, position)
+            if match is None:
+                return fields
+            value, position = self.parse_value(text, match.end())
+            fields.setdefault(match.group(1).lower(), value)
+
+    def entries(self, stream: TextIO) -> Iterator[Tuple[str, str, Dict[str, str]]]:
+        """Yield (entry type, key, fields) for each entry, resolving `@string` macros on the way."""
+        for entry_type, body in self.raw_entries(stream):
+            if entry_type in ("comment", "preamble"):
+                continue
+            if entry_type == "string":
+                for name, value in self.parse_fields(body).items():
+                    self.strings[name] = value
+                continue
+            key, comma, _ = body.partition(",")
+            if not comma:
+                continue
+            yield entry_type, key.strip(), self.parse_fields(body, len(key) + 1)
+
 
 class BibTeXParser:
     """Parser for BibTeX files with improved parsing."""
 
     def __init__(self):
-        pass
+        self.name = "bibtexparser" if BIBTEXPARSER_AVAILABLE else "tokenizer"
 
     def parse_bib_file(self, filepath: Path) -> Dict[str, Citation]:
         """Parse a BibTeX file and return a dictionary of citations."""
         if BIBTEXPARSER_AVAILABLE:
             return self._parse_with_bibtexparser(filepath)
         else:
-            return self._parse_with_regex(filepath)
+            print(
+                "Note: bibtexparser not available, using fallback parser. Install with: pip install bibtexparser"
+            )
+            return self._parse_with_tokenizer(filepath)
+
+    def iter_citations(self, filepath: Path) -> Iterator[Citation]:
+        """Lazily yield the citations of a BibTeX file using BibTeXTokenizer."""
+        tokenizer = BibTeXTokenizer()
+        with open(filepath, "r", encoding="utf-8") as f:
+            for _, key, fields in tokenizer.entries(f):
+                fields = {name: self._clean_latex(value.strip()) for name, value in fields.items()}
+                url, doi = self._entry_url(fields)
+                yield Citation(
+                    key=key,
+                    title=fields.get("title", ""),
+                    year=self._clean_latex(str(fields.get("year", "")).strip()),
+                    url=url,
+                    authors=fields.get("author", ""),
+                    journal=fields.get("journal", fields.get("booktitle", "")),
+                    doi=doi,
+                )
+
+    def _parse_with_tokenizer(self, filepath: Path) -> Dict[str, Citation]:
+        """Parse using the streaming tokenizer (fallback method)."""
+        try:
+            return {citation.key: citation for citation in self.iter_citations(filepath)}
+        except (UnicodeDecodeError, FileNotFoundError) as e:
+            print(f"Error reading bibliography {filepath}: {e}")
+            return {}
+
+    @staticmethod
+    def _normalize_doi(doi: str) -> str:
+        """Reduce a DOI given as a URL or with a "doi:" prefix to its bare, lowercase form."""
+        doi = doi.strip()
+        doi = re.sub(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", "", doi, flags=re.IGNORECASE)
+        return doi.replace("\\_", "_").lower()
+
+    def _entry_url(self, fields: Dict[str, str]) -> Tuple[str, str]:
+        """Return the (url, doi) of an entry, linking DOIs and arXiv ids when there is no URL."""
+        doi = self._normalize_doi(fields.get("doi", ""))
+        url = fields.get("url", fields.get("doi", fields.get("eprint", "")))
+        if url and not url.startswith("http"):
+            if url.startswith("10."):  # DOI
+                url = f"https://doi.org/{url}"
+            elif "arxiv" in url.lower() or fields.get("eprint"):
+                arxiv_id = fields.get("eprint", url)
+                url = f"https://arxiv.org/abs/{arxiv_id}"
+        return url, doi
 
     def _parse_with_bibtexparser(self, filepath: Path) -> Dict[str, Citation]:
         """Parse using the bibtexparser library."""
@@ -149,13 +361,7 @@ class BibTeXParser:
                 key = entry.get("ID", "")
 
                 # Get URL from various fields
-                url = entry.get("url", entry.get("doi", entry.get("eprint", "")))
-                if url and not url.startswith("http"):
-                    if url.startswith("10."):  # DOI
-                        url = f"https://doi.org/{url}"
-                    elif "arxiv" in url.lower() or entry.get("eprint"):
-                        arxiv_id = entry.get("eprint", url)
-                        url = f"https://arxiv.org/abs/{arxiv_id}"
+                url, doi = self._entry_url(entry)
 
                 citation = Citation(
                     key=key,
@@ -166,19 +372,20 @@ class BibTeXParser:
                     journal=self._clean_latex(
                         entry.get("journal", entry.get("booktitle", ""))
                     ),
+                    doi=doi,
                 )
 
                 citations[key] = citation
 
         except Exception as e:
             print(f"Error parsing with bibtexparser: {e}")
-            print("Falling back to regex parser...")
-            return self._parse_with_regex(filepath)
+            print("Falling back to tokenizer...")
+            return self._parse_with_tokenizer(filepath)
 
         return citations
 
     def _parse_with_regex(self, filepath: Path) -> Dict[str, Citation]:
-        """Parse using regex (fallback method)."""
+        """Parse using regex (previous fallback, kept as a benchmark reference)."""
         citations = {}
 
         try:
@@ -199,14 +406,13 @@ class BibTeXParser:
             if not entry_text.startswith("@"):
                 entry_text = "@" + entry_text
 
-            # Extract entry type and key
+            # Extract the entry key
             first_line_match = re.match(
                 r"@(\w+)\s*\{\s*([^,\s]+)\s*,", entry_text, re.IGNORECASE
             )
             if not first_line_match:
                 continue
 
-            entry_type = first_line_match.group(1)
             key = first_line_match.group(2).strip()
 
             # Parse fields more carefully
@@ -227,13 +433,7 @@ class BibTeXParser:
                         fields[field_name] = self._clean_latex(field_value.strip())
 
             # Get URL from various sources
-            url = fields.get("url", fields.get("doi", fields.get("eprint", "")))
-            if url and not url.startswith("http"):
-                if url.startswith("10."):  # DOI
-                    url = f"https://doi.org/{url}"
-                elif "arxiv" in url.lower() or fields.get("eprint"):
-                    arxiv_id = fields.get("eprint", url)
-                    url = f"https://arxiv.org/abs/{arxiv_id}"
+            url, doi = self._entry_url(fields)
 
             citation = Citation(
                 key=key,
@@ -242,6 +442,7 @@ class BibTeXParser:
                 url=url,
                 authors=fields.get("author", ""),
                 journal=fields.get("journal", fields.get("booktitle", "")),
+                doi=doi,
             )
 
             citations[key] = citation
@@ -260,8 +461,11 @@ class BibTeXParser:
         text = re.sub(r"\\[a-zA-Z]+\{([^}]*)\}", r"\1", text)
         text = re.sub(r"\\[a-zA-Z]+", "", text)
 
-        # Remove extra braces
-        text = re.sub(r"\{([^}]*)\}", r"\1", text)
+        # Remove extra braces, innermost first, so nested groups such as {{ChemBERTa}: ...} unwrap fully
+        previous = None
+        while previous != text:
+            previous = text
+            text = re.sub(r"\{([^{}]*)\}", r"\1", text)
 
         # Clean up whitespace and trailing commas
         text = re.sub(r"\s+", " ", text)
@@ -269,9 +473,71 @@ class BibTeXParser:
         return text.strip()
 
 
+def content_hash(filepath: Path) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    return hashlib.sha256(Path(filepath).read_bytes()).hexdigest()
+
+
+class ReadmeBlockCache:
+    """
+    JSON cache of the README block of each section file.
+
+    An entry holds the parsed sections and the rendered Markdown block of one
+    file, and is reused while both the file and the bibliography (identified
+    by its content hash and parser) are unchanged. The whole cache is dropped
+    when this script changes, as the blocks may then render differently.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path = DEFAULT_BLOCK_CACHE_PATH, enabled: bool = True):
+        self.path = Path(path)
+        self.enabled = enabled
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        self.script_hash = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+        valid = data.get("version") == self.VERSION and data.get("script_hash") == self.script_hash
+        self.blocks = data.get("blocks", {}) if valid else {}
+
+    def get(self, filename: str, section_hash: str, bibliography_hash: str) -> Optional[Tuple[List[Section], str]]:
+        """Return the cached (sections, Markdown block) of a section file, or None on a miss."""
+        entry = self.blocks.get(filename)
+        if (
+            not self.enabled
+            or entry is None
+            or entry["section_hash"] != section_hash
+            or entry["bibliography_hash"] != bibliography_hash
+        ):
+            return None
+        return [Section(**section) for section in entry["sections"]], entry["markdown"]
+
+    def put(self, filename: str, section_hash: str, bibliography_hash: str, sections: List[Section], markdown: str):
+        self.blocks[filename] = {
+            "section_hash": section_hash,
+            "bibliography_hash": bibliography_hash,
+            "sections": [asdict(section) for section in sections],
+            "markdown": markdown,
+        }
+
+    def save(self, filenames):
+        """Write the cache, dropping the entries of section files that no longer exist."""
+        self.blocks = {filename: self.blocks[filename] for filename in filenames if filename in self.blocks}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps({"version": self.VERSION, "script_hash": self.script_hash, "blocks": self.blocks}), encoding="utf-8")
+        temp_path.replace(self.path)
+
+
 class ReadmeGenerator:
     """Generates README.md from parsed sections and citations."""
 
+    # Each section file's block is delimited by HTML comments, so it can be replaced on its own
+    BLOCK_PATTERN = re.compile(
+        r"<!-- readme-block: (?P<name>[\w-]+) -->\n.*?<!-- /readme-block: (?P=name) -->", re.DOTALL
+    )
+
     def __init__(self, citations: Dict[str, Citation]):
         self.citations = citations
 
@@ -301,11 +567,14 @@ class ReadmeGenerator:
 
     def _format_citation(self, citation: Citation) -> str:
         """Format a citation as 'Year - Title (hyperlinked)'."""
-        title = citation.title if citation.title else f"Citation {citation.key}"
+        # An asterisk in a title would start emphasis
+        title = citation.title.replace("*", "\\*") if citation.title else f"Citation {citation.key}"
         year = citation.year if citation.year else "Unknown"
 
         if citation.url:
-            return f"{year} - [{title}]({citation.url})"
+            # Parentheses and spaces would end a bare Markdown link destination
+            url = f"<{citation.url}>" if re.search(r"[()\s]", citation.url) else citation.url
+            return f"{year} - [{title}]({url})"
         else:
             return f"{year} - {title}"
 
@@ -328,19 +597,8 @@ class ReadmeGenerator:
             else:
                 missing_keys.append(key)
 
-        # Helper function to safely extract a numeric year for robust sorting.
-        # It handles non-numeric values like 'in press' or '2024a'.
-        def get_year_for_sort(citation: Citation) -> int:
-            try:
-                # Search for the first 4-digit number in the year string.
-                year_match = re.search(r"\d{4}", str(citation.year))
-                return int(year_match.group(0)) if year_match else 0
-            except (ValueError, TypeError):
-                # If year is invalid or not found, treat as 0 to sort it last.
-                return 0
-
-        # Sort the found citations by year in descending order.
-        sorted_citations = sorted(found_citations, key=get_year_for_sort, reverse=True)
+        # Sort the found citations by year in descending order; citations without a year sort last.
+        sorted_citations = sorted(found_citations, key=attrgetter("sort_year"), reverse=True)
 
         # Write the sorted citations to the file.
         for citation in sorted_citations:
@@ -353,74 +611,137 @@ class ReadmeGenerator:
 
         f.write("\n")
 
-    def generate(self, sections_by_file: Dict[str, List[Section]], output_path: Path):
-        """Generate README.md file."""
-        with open(output_path, "w", encoding="utf-8") as f:
-            # (Preamble content remains unchanged)
-            f.write("# General Purpose Models for the Chemical Sciences ✨\n\n")
-            f.write("""![Status](https://img.shields.io/badge/status-active-brightgreen?style=flat-square)
-    ![Contributions Welcome](https://img.shields.io/badge/contributions-welcome-blue?style=flat-square)
-    [![Platform](https://img.shields.io/badge/platform-web-blueviolet?style=flat-square)](https://lnkd.in/eWQVf4jJ)
-    [![arXiv](https://img.shields.io/badge/arXiv-2507.07456-b31b1b.svg)](https://arxiv.org/abs/2507.07456)
+    def ordered_files(self, filenames) -> List[str]:
+        """Return the section file names in the order their blocks appear in the README."""
+        # Sort files according to the desired order
+        sorted_files = []
+        for section_key in self.section_order:
+            if section_key in filenames:
+                sorted_files.append(section_key)
+
+        # Add any remaining files not in the predefined order
+        for filename in filenames:
+            if filename not in sorted_files:
+                sorted_files.append(filename)
+        return sorted_files
+
+    def render_block(self, filename: str, sections: List[Section]) -> str:
+        """Render the Markdown block of one section file: its heading, subsections and citations."""
+        f = io.StringIO()
+        display_name = self.section_display_names.get(filename, filename)
+        f.write(f"## {display_name}\n\n")
 
+        for section in sections:
+            if section.title.lower() == display_name.lower():
+                # Section title is the same as the file name; just write sorted citations.
+                self._write_sorted_citations(f, section.citations)
+            else:
+                # Write the subsection header.
+                header_level = "#" * (section.level + 2)
+                f.write(f"{header_level} {section.title}\n\n")
+                # Write the sorted citations for this subsection.
+                self._write_sorted_citations(f, section.citations)
+        return f.getvalue()
 
-    ## 📘 Read the Review
+    @staticmethod
+    def _wrap_block(filename: str, markdown: str) -> str:
+        return f"<!-- readme-block: {filename} -->\n{markdown}<!-- /readme-block: {filename} -->"
 
-    You can read the review directly on
-    or access it as a collaborative online book at:
+    def render(self, blocks: Dict[str, str]) -> str:
+        """Render the whole README from the Markdown blocks of the section files."""
+        f = io.StringIO()
+        f.write("# General Purpose Models for the Chemical Sciences ✨\n\n")
+        f.write(
+            """![Status](https://img.shields.io/badge/status-active-brightgreen?style=flat-square)
+![Contributions Welcome](https://img.shields.io/badge/contributions-welcome-blue?style=flat-square)
+[![Platform](https://img.shields.io/badge/platform-web-blueviolet?style=flat-square)](https://gpmbook.lamalab.org/)
+[![arXiv](https://img.shields.io/badge/arXiv-2507.07456-b31b1b.svg)](https://arxiv.org/abs/2507.07456)
 
-    👉 [arXiv](https://arxiv.org/pdf/2507.07456)
+## 📘 Read the Review
 
-    👉 [Online Book](https://lnkd.in/eWQVf4jJ)
+You can read the review directly on
+or access it as a collaborative online book at:
 
-    We also **welcome community contributions** — this is a living resource of references we ahve used in the review we aim to keep current with the evolving ecosystem. If you dont find your work or your favourite work here, please add it.
+👉 [arXiv](https://arxiv.org/pdf/2507.07456)
 
-    ### ✨ Join the Community
+👉 [Online Book](https://gpmbook.lamalab.org/)
 
-    Help us grow and improve this resource by sharing your feedback or contributing directly via the online platform.
+We also **welcome community contributions** — this is a living resource of references we have used in the review, and we aim to keep current with the evolving ecosystem. If you don't find your work or your favourite work here, please add it.
 
-    Together, we can keep this reference **useful**, **relevant**, and **up to date** for everyone!
-    This document provides an overview of the research sections and their associated references.
-    """)
-            f.write(
-                "This document provides an overview of the research sections and their associated references.\n\n"
-            )
+### ✨ Join the Community
+
+Help us grow and improve this resource by sharing your feedback or contributing directly via the online platform.
+
+Together, we can keep this reference **useful**, **relevant**, and **up to date** for everyone!
+This document provides an overview of the research sections and their associated references.
+
+"""
+        )
+
+        for filename in self.ordered_files(blocks):
+            f.write(self._wrap_block(filename, blocks[filename]) + "\n\n")
+        return f.getvalue()
+
+    def splice(self, readme: str, blocks: Dict[str, str]) -> Optional[str]:
+        """
+        Replace the blocks of an existing README, keeping the text around them.
+
+        Returns None if the README does not contain exactly these blocks in order.
+        """
+        filenames = [match.group("name") for match in self.BLOCK_PATTERN.finditer(readme)]
+        if filenames != self.ordered_files(blocks):
+            return None
+        return self.BLOCK_PATTERN.sub(
+            lambda match: self._wrap_block(match.group("name"), blocks[match.group("name")]), readme
+        )
 
-            # Sort files according to the desired order
-            sorted_files = []
-            for section_key in self.section_order:
-                if section_key in sections_by_file:
-                    sorted_files.append(section_key)
-
-            # Add any remaining files not in the predefined order
-            for filename in sections_by_file:
-                if filename not in sorted_files:
-                    sorted_files.append(filename)
-
-            for filename in sorted_files:
-                sections = sections_by_file[filename]
-                if not sections:
-                    continue
-
-                display_name = self.section_display_names.get(filename, filename)
-                f.write(f"## {display_name}\n\n")
-
-                for section in sections:
-                    if section.title.lower() == display_name.lower():
-                        # Section title is the same as the file name; just write sorted citations.
-                        self._write_sorted_citations(f, section.citations)
-                    else:
-                        # Write the subsection header.
-                        header_level = "#" * (section.level + 2)
-                        f.write(f"{header_level} {section.title}\n\n")
-                        # Write the sorted citations for this subsection.
-                        self._write_sorted_citations(f, section.citations)
+    def generate(self, sections_by_file: Dict[str, List[Section]], output_path: Path):
+        """Generate README.md file."""
+        blocks = {
+            filename: self.render_block(filename, sections)
+            for filename, sections in sections_by_file.items()
+            if sections
+        }
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(self.render(blocks))
 
     # --- END MODIFICATION ---
 
 
+def parse_args(argv=None):
+    """Parse the command line options."""
+    parser = argparse.ArgumentParser(
+        description="Generate README.md from the LaTeX sections and their citations"
+    )
+    parser.add_argument(
+        "--block-cache",
+        default=str(DEFAULT_BLOCK_CACHE_PATH),
+        help="JSON cache of the rendered README block of each section file",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ignore the block cache and rewrite the whole README",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit with status 1 if README.md is out of date, without writing it or the caches",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for parsing the section files; 0 uses all CPUs (default: 1, "
+        "as starting the processes costs more than parsing a few small files)",
+    )
+    return parser.parse_args(argv)
+
+
 def main():
     """Main function to orchestrate the README generation."""
+    args = parse_args()
+
     # Define paths
     base_path = Path("convert_book/extracted_latex")
     sections_path = base_path / "sections"
@@ -455,24 +776,57 @@ def main():
     else:
         print("No citations found - check BibTeX parsing")
 
-    # Parse all LaTeX files
-    print("\nParsing LaTeX sections...")
+    # Reuse the blocks of section files unchanged since the last run
+    bibliography_hash = f"{bib_parser.name}:{content_hash(bib_path)}"
+    block_cache = ReadmeBlockCache(args.block_cache, enabled=not args.rebuild)
+    tex_files = sorted(sections_path.glob("*.tex"))
+    section_hashes = {tex_file: content_hash(tex_file) for tex_file in tex_files}
     sections_by_file = {}
-
-    for tex_file in sections_path.glob("*.tex"):
-        print(f"Processing {tex_file.name}...")
-        sections = latex_parser.parse_file(tex_file)
+    blocks = {}
+    stale_files = []
+    for tex_file in tex_files:
+        cached = block_cache.get(tex_file.stem, section_hashes[tex_file], bibliography_hash)
+        if cached is None:
+            stale_files.append(tex_file)
+        elif cached[0]:
+            sections_by_file[tex_file.stem], blocks[tex_file.stem] = cached
+
+    # Parse the changed LaTeX files
+    print("\nParsing LaTeX sections...")
+    generator = ReadmeGenerator(citations)
+    for tex_file, (sections, seconds) in latex_parser.parse_files(stale_files, args.jobs).items():
+        print(
+            f"Processed {tex_file.name}: {len(sections)} sections, "
+            f"{sum(len(section.citations) for section in sections)} citations in {seconds * 1000:.1f} ms"
+        )
+        markdown = generator.render_block(tex_file.stem, sections) if sections else ""
         if sections:
             sections_by_file[tex_file.stem] = sections
-
-    print(f"Processed {len(sections_by_file)} files")
-
-    # Generate README
-    print("Generating README...")
-    generator = ReadmeGenerator(citations)
-    generator.generate(sections_by_file, output_path)
-
-    print(f"README.md generated successfully at {output_path}")
+            blocks[tex_file.stem] = markdown
+        block_cache.put(tex_file.stem, section_hashes[tex_file], bibliography_hash, sections, markdown)
+
+    blocks = {tex_file.stem: blocks[tex_file.stem] for tex_file in tex_files if tex_file.stem in blocks}
+    print(f"Processed {len(stale_files)} files, reused {len(tex_files) - len(stale_files)} cached blocks")
+
+    # Splice the blocks into the existing README, or render it from scratch
+    readme = output_path.read_text(encoding="utf-8") if output_path.exists() else None
+    updated = None if readme is None or args.rebuild else generator.splice(readme, blocks)
+    if updated is None:
+        updated = generator.render(blocks)
+
+    if args.check:
+        if updated != readme:
+            print(f"Error: {output_path} is out of date. Run scripts/prepare_readme.py to update it")
+            sys.exit(1)
+        print(f"{output_path} is up to date")
+    elif updated == readme:
+        print(f"{output_path} is up to date, not rewritten")
+    else:
+        print("Generating README...")
+        output_path.write_text(updated, encoding="utf-8")
+        print(f"README.md generated successfully at {output_path}")
+    if not args.check:
+        block_cache.save([tex_file.stem for tex_file in tex_files])
 
     # Print summary
     total_sections = sum(len(sections) for sections in sections_by_file.values())
@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# The converter and the README generator are standalone scripts, not an installed package
+for script_dir in ("convert_tex", "scripts"):
+    sys.path.insert(0, str(REPO_ROOT / script_dir))
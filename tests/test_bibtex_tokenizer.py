@@ -0,0 +1,92 @@
+import io
+from pathlib import Path
+
+import prepare_readme
+import pytest
+
+REFERENCES_BIB = Path(__file__).resolve().parent.parent / "convert_tex" / "extracted_latex" / "references.bib"
+
+# Entries missing a comma between two fields, which bibtexparser drops and the tokenizer still reads
+MALFORMED_ENTRIES = {"silver2025welcome"}
+
+SAMPLE_BIB = r"""
+@comment{Ignored, including @article{inner, title = {Not an entry}}}
+@preamble{"\newcommand{\noop}[1]{}"}
+@string{jacs = "J. Am. Chem. Soc."}
+@STRING(conf = {the {Benchmark} Conference})
+
+@Article{doe2024,
+  title = {The {NMR} of {$^{13}$C}: {nested {braces}}},
+  author = "Doe, J. and {\"O}zt{\"u}rk, A.",
+  journal = jacs,
+  year = 2024,
+  month = mar,
+  note = "Presented at " # conf # " 2024",
+  title = {Duplicate fields keep the first value},
+}
+
+@misc(roe2023, title = "Quoted \"escaped\" title", eprint = {2301.00001})
+"""
+
+
+def test_entries_parse_quoted_values_strings_and_nested_braces():
+    entries = {key: (entry_type, fields) for entry_type, key, fields in prepare_readme.BibTeXTokenizer().entries(io.StringIO(SAMPLE_BIB))}
+
+    assert list(entries) == ["doe2024", "roe2023"]
+    entry_type, fields = entries["doe2024"]
+    assert entry_type == "article"
+    assert fields == {
+        "title": "The {NMR} of {$^{13}$C}: {nested {braces}}",
+        "author": r"Doe, J. and {\"O}zt{\"u}rk, A.",
+        "journal": "J. Am. Chem. Soc.",
+        "year": "2024",
+        "month": "Mar",
+        "note": "Presented at the {Benchmark} Conference 2024",
+    }
+    assert entries["roe2023"] == ("misc", {"title": r"Quoted \"escaped\" title", "eprint": "2301.00001"})
+
+
+def test_entries_do_not_depend_on_chunk_boundaries():
+    expected = list(prepare_readme.BibTeXTokenizer().entries(io.StringIO(SAMPLE_BIB)))
+
+    for chunk_size in (1, 7, 64):
+        assert list(prepare_readme.BibTeXTokenizer(chunk_size).entries(io.StringIO(SAMPLE_BIB))) == expected
+
+
+def test_iter_citations_cleans_fields(tmp_path):
+    bib_file = tmp_path / "sample.bib"
+    bib_file.write_text(SAMPLE_BIB, encoding="utf-8")
+
+    citations = {citation.key: citation for citation in prepare_readme.BibTeXParser().iter_citations(bib_file)}
+
+    assert citations["doe2024"].title == "The NMR of $^13$C: nested braces"
+    assert citations["doe2024"].journal == "J. Am. Chem. Soc."
+    assert citations["roe2023"].url == "https://arxiv.org/abs/2301.00001"
+
+
+def test_tokenizer_matches_regex_parser_on_references_bib():
+    parser = prepare_readme.BibTeXParser()
+    tokenized = parser._parse_with_tokenizer(REFERENCES_BIB)
+    regex = parser._parse_with_regex(REFERENCES_BIB)
+
+    assert len(tokenized) == 664
+    assert tokenized.keys() == regex.keys()
+    # The regex parser truncates fields with nested braces, so only compare the fields it gets right
+    for key, citation in tokenized.items():
+        assert (citation.year, citation.url, citation.doi) == (regex[key].year, regex[key].url, regex[key].doi)
+
+
+@pytest.mark.skipif(not prepare_readme.BIBTEXPARSER_AVAILABLE, reason="bibtexparser is not installed")
+def test_tokenizer_matches_bibtexparser_on_references_bib():
+    with open(REFERENCES_BIB, encoding="utf-8") as f:
+        entry_types = {key: entry_type for entry_type, key, _ in prepare_readme.BibTeXTokenizer().entries(f)}
+    with open(REFERENCES_BIB, encoding="utf-8") as f:
+        database = prepare_readme.bibtexparser.load(f, parser=prepare_readme.BibTexParser(common_strings=True))
+    parser = prepare_readme.BibTeXParser()
+    tokenized = parser._parse_with_tokenizer(REFERENCES_BIB)
+    reference = parser._parse_with_bibtexparser(REFERENCES_BIB)
+
+    assert tokenized.keys() - MALFORMED_ENTRIES == reference.keys()
+    assert {key: entry_types[key] for key in reference} == {entry["ID"]: entry["ENTRYTYPE"].lower() for entry in database.entries}
+    for key, citation in reference.items():
+        assert (tokenized[key].year, tokenized[key].journal) == (citation.year, citation.journal)
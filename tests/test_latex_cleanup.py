@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import convert_to_quarto_book as converter
+import pytest
+
+SECTIONS_DIR = Path(converter.__file__).parent / "extracted_latex" / "sections"
+
+# Differences from the regex implementation that are fixes: it stopped \ce{} at the first closing brace
+KNOWN_REGEX_DIFFERENCES = {
+    "introduction.tex": [("^{13C}", "^{13}C")],
+}
+
+
+@pytest.mark.parametrize("section_file", sorted(SECTIONS_DIR.glob("*.tex")), ids=lambda path: path.name)
+def test_clean_latex_content_matches_regex_reference(section_file):
+    content = section_file.read_text(encoding="utf-8")
+
+    expected = converter._clean_latex_content_regex(content)
+    for regex_output, fixed_output in KNOWN_REGEX_DIFFERENCES.get(section_file.name, []):
+        assert regex_output in expected
+        expected = expected.replace(regex_output, fixed_output)
+
+    assert converter.clean_latex_content(content) == expected
+
+
+@pytest.mark.parametrize(
+    ("latex", "expected"),
+    [
+        # The regex version dropped \title{ up to the first closing brace and left "title}"
+        (r"\title{A {nested} title}" + "\nText", "Text"),
+        (r"\ce{^{13}C}-NMR", "^{13}C-NMR"),
+        (r"\ce{H2O}", "H2O"),
+        (r"\usepackage[utf8]{inputenc}" + "\n" + r"\section*{Intro}", r"\section{Intro}"),
+        (r"\modelname{GPT-4}", r"\texttt{GPT-4}"),
+        (r"\begin{document}Body\end{document}", "Body"),
+        (r"\begin{figure}x\end{figure}", r"\begin{figure}x\end{figure}"),
+        (r"\cite{a, , b}", r"\cite{a,b}"),
+        (r"\autocite{, a}", r"\autocite{a}"),
+        (r"\citep{a, }", r"\citep{a}"),
+    ],
+)
+def test_clean_latex_content_edge_cases(latex, expected):
+    assert converter.clean_latex_content(latex) == expected
+
+
+def test_clean_latex_content_matches_braces_across_escaped_braces():
+    assert converter.clean_latex_content(r"\ce{a\{b\}c} rest") == r"a\{b\}c rest"
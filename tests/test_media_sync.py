@@ -0,0 +1,53 @@
+import os
+
+import convert_to_quarto_book as converter
+import pytest
+
+
+@pytest.fixture
+def linked_figure(tmp_path):
+    """A source figure whose PNG was synced into the output as a hardlink, with a newer PDF."""
+    source = tmp_path / "figures"
+    source.mkdir()
+    (source / "plot.png").write_bytes(b"source png")
+    output = tmp_path / "media" / "figures"
+    converter.sync_directory(source, output, "hardlink")
+    if not os.path.samefile(source / "plot.png", output / "plot.png"):
+        pytest.skip("hardlinks are not supported here")
+    (source / "plot.pdf").write_bytes(b"%PDF-1.4 source pdf")
+    converter.sync_directory(source, output, "hardlink")
+    # Make the PDF newer than the linked PNG, so the PNG is rasterized again
+    mtime_ns = (source / "plot.png").stat().st_mtime_ns
+    os.utime(output / "plot.pdf", ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+    return source, output
+
+
+def test_rasterize_pdf_replaces_hardlinked_png(linked_figure, monkeypatch):
+    source, output = linked_figure
+
+    def fake_pdftoppm(cmd):
+        # pdftoppm appends .png to the output prefix and writes the file in place
+        with open(cmd[-1] + ".png", "wb") as f:
+            f.write(b"rasterized png")
+        return True, ""
+
+    monkeypatch.setattr(converter, "_run_tool", fake_pdftoppm)
+    outcome = converter.rasterize_pdf(output / "plot.pdf")
+
+    assert outcome["method"] == "pdftoppm"
+    assert (output / "plot.png").read_bytes() == b"rasterized png"
+    assert (source / "plot.png").read_bytes() == b"source png"
+    assert not os.path.samefile(source / "plot.png", output / "plot.png")
+    assert sorted(path.name for path in output.iterdir()) == ["plot.pdf", "plot.png"]
+
+
+def test_rasterize_pdf_restores_cached_png_without_writing_through_link(linked_figure, tmp_path):
+    source, output = linked_figure
+    cache = converter.BuildCache(tmp_path / "cache")
+    cache.put("rasterize", cache.key("rasterize", output / "plot.pdf", str(converter.RASTER_DPI)), b"cached png")
+
+    outcome = converter.rasterize_pdf(output / "plot.pdf", cache)
+
+    assert outcome["method"] == "cached"
+    assert (output / "plot.png").read_bytes() == b"cached png"
+    assert (source / "plot.png").read_bytes() == b"source png"
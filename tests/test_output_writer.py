@@ -0,0 +1,84 @@
+import os
+
+import convert_to_quarto_book as converter
+import pytest
+
+
+def build(output_dir, manifest_path, outputs):
+    """Run one build that generates `outputs` ({name: text}) and return its writer."""
+    writer = converter.OutputWriter(output_dir)
+    for name, content in outputs.items():
+        writer.write_text(output_dir / name, content)
+    writer.flush()
+    writer.remove_stale(manifest_path)
+    writer.write_manifest(manifest_path)
+    return writer
+
+
+def test_unchanged_rewrite_keeps_mtime(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    output_dir = tmp_path / "book"
+    build(output_dir, manifest_path, {"01-intro.qmd": "# Intro\n", "_quarto.yml": "project: book\n"})
+    chapter = output_dir / "01-intro.qmd"
+    os.utime(chapter, ns=(1_000_000_000, 1_000_000_000))
+
+    writer = build(output_dir, manifest_path, {"01-intro.qmd": "# Intro\n", "_quarto.yml": "project: website\n"})
+
+    assert chapter.stat().st_mtime_ns == 1_000_000_000
+    assert writer.unchanged == [chapter]
+    assert writer.changed == [output_dir / "_quarto.yml"]
+
+
+def test_stale_output_is_removed(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    output_dir = tmp_path / "book"
+    build(output_dir, manifest_path, {"01-intro.qmd": "# Intro\n", "02-old.qmd": "# Old\n"})
+    (output_dir / "notes.md").write_text("Not generated by the converter\n")
+
+    writer = build(output_dir, manifest_path, {"01-intro.qmd": "# Intro\n"})
+
+    assert writer.removed == [output_dir / "02-old.qmd"]
+    assert sorted(path.name for path in output_dir.iterdir()) == ["01-intro.qmd", "notes.md"]
+
+
+def test_stale_outputs_of_another_output_dir_are_kept(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    build(tmp_path / "book", manifest_path, {"02-old.qmd": "# Old\n"})
+
+    writer = build(tmp_path / "other", manifest_path, {"01-intro.qmd": "# Intro\n"})
+
+    assert writer.removed == []
+    assert (tmp_path / "book" / "02-old.qmd").exists()
+
+
+def test_interrupted_stage_leaves_live_tree_untouched(tmp_path):
+    output_dir = tmp_path / "book"
+    output_dir.mkdir()
+    (output_dir / "01-intro.qmd").write_text("# Intro\n")
+    writer = converter.OutputWriter(output_dir)
+
+    with pytest.raises(RuntimeError):
+        writer.write_text(output_dir / "01-intro.qmd", "# Half-converted\n")
+        writer.write_text(output_dir / "02-new.qmd", "# New\n")
+        raise RuntimeError("pandoc crashed")
+
+    assert (output_dir / "01-intro.qmd").read_text() == "# Intro\n"
+    assert [path.name for path in output_dir.iterdir()] == ["01-intro.qmd"]
+
+
+def test_failed_replace_leaves_old_output_and_no_temp_file(tmp_path, monkeypatch):
+    output_dir = tmp_path / "book"
+    output_dir.mkdir()
+    (output_dir / "01-intro.qmd").write_text("# Intro\n")
+    writer = converter.OutputWriter(output_dir)
+    writer.write_text(output_dir / "01-intro.qmd", "# Rewritten\n")
+
+    def interrupted_replace(src, dst):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(converter.os, "replace", interrupted_replace)
+    with pytest.raises(KeyboardInterrupt):
+        writer.flush()
+
+    assert (output_dir / "01-intro.qmd").read_text() == "# Intro\n"
+    assert [path.name for path in output_dir.iterdir()] == ["01-intro.qmd"]